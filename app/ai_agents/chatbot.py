@@ -7,14 +7,43 @@ for enhanced task management capabilities.
 """
 
 import asyncio
+import re
 from typing import Dict, Any, Optional, List
 from pydantic import BaseModel
-from openai import AsyncOpenAI
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+import httpx
+from cachetools import TTLCache
 import logging
-from app.services.rag_client import get_rag_client, RAGQueryResponse
+from app.config import settings
+from app.services.rag_client import get_rag_client, RAGClient, RAGQueryResponse
 
 logger = logging.getLogger(__name__)
 
+# Phrases that suggest the user is asking a knowledge-seeking question
+_KNOWLEDGE_KEYWORDS = (
+    'what is', 'how do', 'explain', 'tell me about', 'define',
+    'information about', 'details on', 'can you help', 'where can i',
+    'when', 'why', 'how to', 'guide', 'tutorial', 'instructions'
+)
+# Single alternation so the message is scanned once instead of once per keyword
+_KNOWLEDGE_PATTERN = re.compile("|".join(re.escape(k) for k in _KNOWLEDGE_KEYWORDS))
+
+# System prompt shared by every conversation; never mutated
+_SYSTEM_MESSAGE: Dict[str, str] = {
+    "role": "system",
+    "content": (
+        "You are an AI assistant for a Todo application. "
+        "You can help users manage their tasks, answer questions about features, "
+        "and provide general assistance. If you have specific knowledge context provided, "
+        "use it to answer the user's question. Otherwise, provide general assistance "
+        "related to task management and productivity."
+    )
+}
+
+# Successful RAG answers keyed by (project_id, query, threshold), so retried or
+# repeated questions skip the round trip to the RAG engine
+_rag_cache: TTLCache = TTLCache(maxsize=1024, ttl=300)
+
 
 class ChatMessage(BaseModel):
     """Represents a chat message in the conversation"""
@@ -55,9 +84,20 @@ class TodoAIChatbot:
             openai_api_key: OpenAI API key for language model access
             model: The OpenAI model to use for responses
         """
-        self.openai_client = AsyncOpenAI(api_key=openai_api_key)
+        # HTTP/2 lets concurrent chat requests share one multiplexed connection
+        self.openai_client = AsyncOpenAI(
+            api_key=openai_api_key,
+            http_client=DefaultAsyncHttpxClient(
+                http2=True,
+                limits=httpx.Limits(max_connections=100, max_keepalive_connections=50)
+            )
+        )
         self.model = model
-        self.rag_client = get_rag_client()
+
+    @property
+    def rag_client(self) -> RAGClient:
+        """The shared RAG client, looked up on each use so a closed one is replaced"""
+        return get_rag_client()
 
     async def chat(self, request: ChatRequest) -> ChatResponse:
         """
@@ -70,7 +110,7 @@ class TodoAIChatbot:
             ChatResponse with the AI's response and any sources used
         """
         # Determine if we should use RAG for this query
-        should_use_rag = request.use_rag and await self._should_query_rag(request.messages[-1].content)
+        should_use_rag = request.use_rag and self._should_query_rag(request.messages[-1].content)
 
         rag_response: Optional[RAGQueryResponse] = None
         sources: List[Dict[str, Any]] = []
@@ -79,13 +119,19 @@ class TodoAIChatbot:
             try:
                 # Use the user ID directly as project ID for RAG isolation
                 project_id = request.user_id
-
-                # Query the RAG system
-                rag_response = await self.rag_client.query_project(
-                    project_id=project_id,
-                    query=request.messages[-1].content,
-                    threshold=request.rag_threshold
-                )
+                query = request.messages[-1].content
+                cache_key = (project_id, query, request.rag_threshold)
+
+                # Query the RAG system unless we answered the same question recently
+                rag_response = _rag_cache.get(cache_key)
+                if rag_response is None:
+                    rag_response = await self.rag_client.query_project(
+                        project_id=project_id,
+                        query=query,
+                        threshold=request.rag_threshold
+                    )
+                    if rag_response.success:
+                        _rag_cache[cache_key] = rag_response
 
                 if rag_response.success:
                     sources = rag_response.sources
@@ -110,7 +156,7 @@ class TodoAIChatbot:
             context_used=bool(rag_response and rag_response.success)
         )
 
-    async def _should_query_rag(self, user_message: str) -> bool:
+    def _should_query_rag(self, user_message: str) -> bool:
         """
         Determine if the user's message should trigger a RAG query.
 
@@ -121,14 +167,7 @@ class TodoAIChatbot:
             True if RAG should be queried, False otherwise
         """
         # Simple heuristic: if the message contains certain keywords or seems knowledge-seeking
-        knowledge_keywords = [
-            'what is', 'how do', 'explain', 'tell me about', 'define',
-            'information about', 'details on', 'can you help', 'where can i',
-            'when', 'why', 'how to', 'guide', 'tutorial', 'instructions'
-        ]
-
-        lower_msg = user_message.lower()
-        return any(keyword in lower_msg for keyword in knowledge_keywords)
+        return _KNOWLEDGE_PATTERN.search(user_message.lower()) is not None
 
     def _prepare_context_messages(
         self,
@@ -145,20 +184,8 @@ class TodoAIChatbot:
         Returns:
             List of messages formatted for the language model
         """
-        prepared_messages = []
-
-        # Add system message with context about the todo application
-        system_message = {
-            "role": "system",
-            "content": (
-                "You are an AI assistant for a Todo application. "
-                "You can help users manage their tasks, answer questions about features, "
-                "and provide general assistance. If you have specific knowledge context provided, "
-                "use it to answer the user's question. Otherwise, provide general assistance "
-                "related to task management and productivity."
-            )
-        }
-        prepared_messages.append(system_message)
+        # Start with the system message describing the todo application
+        prepared_messages = [_SYSTEM_MESSAGE]
 
         # Add RAG context if available
         if rag_context:
@@ -169,11 +196,10 @@ class TodoAIChatbot:
             prepared_messages.append(context_message)
 
         # Add original conversation history
-        for msg in original_messages:
-            prepared_messages.append({
-                "role": msg.role,
-                "content": msg.content
-            })
+        prepared_messages += [
+            {"role": msg.role, "content": msg.content}
+            for msg in original_messages
+        ]
 
         return prepared_messages
 
@@ -254,11 +280,8 @@ def get_ai_chatbot() -> Optional[TodoAIChatbot]:
     """
     global _ai_chatbot
     if _ai_chatbot is None:
-        import os
-        openai_api_key = os.getenv("OPENAI_API_KEY")
-        if openai_api_key:
-            model = os.getenv("OPENAI_MODEL", "gpt-4")
-            _ai_chatbot = TodoAIChatbot(openai_api_key=openai_api_key, model=model)
+        if settings.openai_api_key:
+            _ai_chatbot = TodoAIChatbot(openai_api_key=settings.openai_api_key, model=settings.openai_model)
         else:
             logger.warning("OpenAI API key not found. AI chatbot will not be available.")
     return _ai_chatbot
\ No newline at end of file
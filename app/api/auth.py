@@ -1,9 +1,12 @@
+import logging
 from fastapi import APIRouter, HTTPException, Depends
 from pydantic import BaseModel
 from app.database import get_session
 from app.auth.signup_service import signup_user
 from app.auth.signin_service import signin_user
-from sqlmodel import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
@@ -20,31 +23,29 @@ class SigninRequest(BaseModel):
 
 
 @router.post("/signup")
-def signup(payload: SignupRequest, db: Session = Depends(get_session)):
-    print(f"Signup endpoint called with: {payload}")
+async def signup(payload: SignupRequest, db: AsyncSession = Depends(get_session)):
+    logger.debug("Signup endpoint called for %s", payload.email)
     try:
-        result = signup_user(
+        result = await signup_user(
             db,
             payload.full_name,
             payload.email,
             payload.password,
         )
-        print(f"Signup successful: {result}")
+        logger.debug("Signup successful for %s", payload.email)
         return result
     except ValueError as e:
-        print(f"Signup ValueError: {e}")
+        logger.debug("Signup rejected for %s: %s", payload.email, e)
         raise HTTPException(status_code=400, detail=str(e))
-    except Exception as e:
-        print(f"Signup general error: {e}")
-        import traceback
-        traceback.print_exc()
+    except Exception:
+        logger.exception("Signup failed")
         raise HTTPException(status_code=400, detail="Signup failed")
 
 
 @router.post("/signin")
-def signin(payload: SigninRequest, db: Session = Depends(get_session)):
+async def signin(payload: SigninRequest, db: AsyncSession = Depends(get_session)):
     try:
-        return signin_user(
+        return await signin_user(
             db,
             payload.email,
             payload.password,
@@ -1,112 +1,109 @@
 from fastapi import APIRouter, Depends, HTTPException, Path, Query
-from sqlmodel import Session
+from fastapi.responses import ORJSONResponse
+from pydantic import TypeAdapter
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import datetime, timezone
 from typing import List, Optional
 import uuid
 from app.database import get_session
 from app.models.task import Task, TaskCreate, TaskUpdate
 from app.services.task_service import TaskService
-from app.auth.jwt_handler import get_current_user
+from app.auth.jwt_handler import require_user
 
 router = APIRouter(tags=["tasks"])
 
-@router.get("/api/{user_id}/tasks", response_model=List[Task])
+# Serializes task lists without FastAPI's response_model validation pass
+_TASKS_ADAPTER = TypeAdapter(List[Task])
+
+@router.get("/api/{user_id}/tasks", responses={200: {"model": List[Task]}})
 async def list_tasks(
-    user_id: str = Path(...),
     status: Optional[str] = None,
     priority: Optional[str] = None,
     search: Optional[str] = Query(None),
     sort_by: str = "created_at",
-    session: Session = Depends(get_session),
-    current_user: dict = Depends(get_current_user)
+    limit: int = Query(50, ge=1, le=200),
+    offset: int = Query(0, ge=0),
+    before_created_at: Optional[datetime] = Query(None),
+    before_id: Optional[uuid.UUID] = Query(None),
+    session: AsyncSession = Depends(get_session),
+    user_uuid: uuid.UUID = Depends(require_user)
 ):
-    # Verify that the user_id in the URL matches the authenticated user
-    if user_id != current_user["id"]:
-        raise HTTPException(status_code=403, detail="Access forbidden: Cannot access other users' tasks")
+    # Pass the created_at and id of the last task received to get the next page
+    cursor = None
+    if before_created_at is not None or before_id is not None:
+        if before_created_at is None or before_id is None:
+            raise HTTPException(status_code=400, detail="before_created_at and before_id must be given together")
+        # The cursor is a position in the created_at order only
+        if sort_by in ("priority", "title"):
+            raise HTTPException(status_code=400, detail="Cursor pagination requires the default created_at sort")
+        # Stored timestamps are naive UTC
+        if before_created_at.tzinfo is not None:
+            before_created_at = before_created_at.astimezone(timezone.utc).replace(tzinfo=None)
+        cursor = (before_created_at, before_id)
 
-    return TaskService.get_tasks(
+    tasks = await TaskService.get_tasks(
         session,
-        uuid.UUID(current_user["id"]),
+        user_uuid,
         status,
         priority,
         search,
-        sort_by
+        sort_by,
+        limit,
+        offset,
+        cursor
     )
+    return ORJSONResponse(content=_TASKS_ADAPTER.dump_python(tasks, mode="json"))
 
 @router.post("/api/{user_id}/tasks", response_model=Task, status_code=201)
 async def create_task(
-    user_id: str = Path(...),
     task: TaskCreate = None,
-    session: Session = Depends(get_session),
-    current_user: dict = Depends(get_current_user)
+    session: AsyncSession = Depends(get_session),
+    user_uuid: uuid.UUID = Depends(require_user)
 ):
-    # Verify that the user_id in the URL matches the authenticated user
-    if user_id != current_user["id"]:
-        raise HTTPException(status_code=403, detail="Access forbidden: Cannot create tasks for other users")
-
-    return TaskService.create_task(session, task, uuid.UUID(current_user["id"]))
+    return await TaskService.create_task(session, task, user_uuid)
 
 @router.get("/api/{user_id}/tasks/{task_id}", response_model=Task)
 async def get_task(
-    user_id: str = Path(...),
     task_id: uuid.UUID = Path(...),
-    session: Session = Depends(get_session),
-    current_user: dict = Depends(get_current_user)
+    session: AsyncSession = Depends(get_session),
+    user_uuid: uuid.UUID = Depends(require_user)
 ):
-    # Verify that the user_id in the URL matches the authenticated user
-    if user_id != current_user["id"]:
-        raise HTTPException(status_code=403, detail="Access forbidden: Cannot access other users' tasks")
-
-    task = TaskService.get_task_by_id(session, task_id, uuid.UUID(current_user["id"]))
+    task = await TaskService.get_task_by_id(session, task_id, user_uuid)
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
     return task
 
 @router.put("/api/{user_id}/tasks/{task_id}", response_model=Task)
 async def update_task(
-    user_id: str = Path(...),
     task_id: uuid.UUID = Path(...),
     task: TaskUpdate = None,
-    session: Session = Depends(get_session),
-    current_user: dict = Depends(get_current_user)
+    session: AsyncSession = Depends(get_session),
+    user_uuid: uuid.UUID = Depends(require_user)
 ):
-    # Verify that the user_id in the URL matches the authenticated user
-    if user_id != current_user["id"]:
-        raise HTTPException(status_code=403, detail="Access forbidden: Cannot update other users' tasks")
-
-    db_task = TaskService.update_task(session, task_id, task, uuid.UUID(current_user["id"]))
+    db_task = await TaskService.update_task(session, task_id, task, user_uuid)
     if not db_task:
         raise HTTPException(status_code=404, detail="Task not found")
     return db_task
 
 @router.patch("/api/{user_id}/tasks/{task_id}/complete", response_model=Task)
 async def toggle_task_completion(
-    user_id: str = Path(...),
     task_id: uuid.UUID = Path(...),
     completed: bool = None,
-    session: Session = Depends(get_session),
-    current_user: dict = Depends(get_current_user)
+    session: AsyncSession = Depends(get_session),
+    user_uuid: uuid.UUID = Depends(require_user)
 ):
-    # Verify that the user_id in the URL matches the authenticated user
-    if user_id != current_user["id"]:
-        raise HTTPException(status_code=403, detail="Access forbidden: Cannot update other users' tasks")
-
-    task = TaskService.update_task_completion(session, task_id, completed, uuid.UUID(current_user["id"]))
+    task = await TaskService.update_task_completion(session, task_id, completed, user_uuid)
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
     return task
 
 @router.delete("/api/{user_id}/tasks/{task_id}", status_code=204)
 async def delete_task(
-    user_id: str = Path(...),
     task_id: uuid.UUID = Path(...),
-    session: Session = Depends(get_session),
-    current_user: dict = Depends(get_current_user)
+    session: AsyncSession = Depends(get_session),
+    user_uuid: uuid.UUID = Depends(require_user)
 ):
-    # Verify that the user_id in the URL matches the authenticated user
-    if user_id != current_user["id"]:
-        raise HTTPException(status_code=403, detail="Access forbidden: Cannot delete other users' tasks")
-
-    success = TaskService.delete_task(session, task_id, uuid.UUID(current_user["id"]))
+    success = await TaskService.delete_task(session, task_id, user_uuid)
     if not success:
         raise HTTPException(status_code=404, detail="Task not found")
     return None
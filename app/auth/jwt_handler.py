@@ -1,4 +1,5 @@
-from fastapi import Depends, HTTPException, status
+import uuid
+from fastapi import Depends, HTTPException, Path, Request, status
 from fastapi.security import OAuth2PasswordBearer
 from .jwt_service import JWTService
 
@@ -8,6 +9,9 @@ oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/auth/signin")
 async def get_current_user(token: str = Depends(oauth2_scheme)):
     try:
         user_data = JWTService.verify_token(token)
+        # Parse the user id once so handlers can use the UUID directly
+        if "id" in user_data:
+            user_data["uid"] = uuid.UUID(user_data["id"])
         return user_data
     except ValueError as e:
         raise HTTPException(
@@ -15,3 +19,26 @@ async def get_current_user(token: str = Depends(oauth2_scheme)):
             detail=str(e),
             headers={"WWW-Authenticate": "Bearer"},
         )
+
+
+# 403 detail per HTTP method, matching the wording the task endpoints have always used
+_FORBIDDEN_DETAILS = {
+    "GET": "Access forbidden: Cannot access other users' tasks",
+    "POST": "Access forbidden: Cannot create tasks for other users",
+    "PUT": "Access forbidden: Cannot update other users' tasks",
+    "PATCH": "Access forbidden: Cannot update other users' tasks",
+    "DELETE": "Access forbidden: Cannot delete other users' tasks",
+}
+
+async def require_user(
+    request: Request,
+    user_id: str = Path(...),
+    current_user: dict = Depends(get_current_user)
+) -> uuid.UUID:
+    """Ensure the `{user_id}` path segment is the authenticated user and return their UUID"""
+    if user_id != current_user["id"]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=_FORBIDDEN_DETAILS.get(request.method, _FORBIDDEN_DETAILS["GET"]),
+        )
+    return current_user["uid"]
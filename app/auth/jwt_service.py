@@ -1,21 +1,46 @@
-import jwt
+import base64
+import binascii
+import hmac
 import time
-import os
+from hashlib import blake2b
 from typing import Dict, Any
 import logging
+import orjson
+from cachetools import TTLCache
+from app.config import settings
 
 logger = logging.getLogger(__name__)
 
 # Use Better Auth secret if available, fallback to JWT_SECRET, but ensure it's set in production
-JWT_SECRET = os.getenv("BETTER_AUTH_SECRET", os.getenv("JWT_SECRET", "CHANGE_THIS_TO_ENV_SECRET"))
+JWT_SECRET = settings.jwt_secret
 
-if JWT_SECRET == "CHANGE_THIS_TO_ENV_SECRET" and os.getenv("ENVIRONMENT") == "production":
+if JWT_SECRET == "CHANGE_THIS_TO_ENV_SECRET" and settings.is_production:
     logger.error("WARNING: Using default JWT secret in production. This is insecure!")
     raise ValueError("JWT_SECRET environment variable is required in production")
 
 JWT_ALGORITHM = "HS256"
-# Token expiration: 24 hours in production, 1 hour in development
-JWT_EXPIRES_IN = int(os.getenv("JWT_EXPIRES_IN", 24 * 60 * 60 if os.getenv("ENVIRONMENT") == "production" else 60 * 60))
+JWT_EXPIRES_IN = settings.jwt_expires_in
+
+_JWT_KEY = JWT_SECRET.encode()
+_JWT_HEADER = base64.urlsafe_b64encode(
+    orjson.dumps({"alg": JWT_ALGORITHM, "typ": "JWT"})
+).rstrip(b"=")
+
+# Recently verified tokens, keyed by a digest of the token string
+_verified_tokens: TTLCache = TTLCache(maxsize=10000, ttl=60)
+
+
+def _b64url_encode(data: bytes) -> bytes:
+    return base64.urlsafe_b64encode(data).rstrip(b"=")
+
+
+def _b64url_decode(data: bytes) -> bytes:
+    return base64.urlsafe_b64decode(data + b"=" * (-len(data) % 4))
+
+
+def _sign(signing_input: bytes) -> bytes:
+    # hmac.digest uses OpenSSL's one-shot HMAC-SHA256
+    return hmac.digest(_JWT_KEY, signing_input, "sha256")
 
 
 class JWTService:
@@ -23,31 +48,52 @@ class JWTService:
     def create_token(payload: Dict[str, Any]) -> str:
         now = int(time.time())
         token_payload = {
-            **payload,
+            "id": payload["id"],
+            "user_id": payload["user_id"],
+            "email": payload["email"],
             "iat": now,
             "exp": now + JWT_EXPIRES_IN,
         }
 
         logger.info(f"Creating JWT token for user: {payload.get('id', 'unknown')}")
-        return jwt.encode(
-            token_payload,
-            JWT_SECRET,
-            algorithm=JWT_ALGORITHM
-        )
+        signing_input = _JWT_HEADER + b"." + _b64url_encode(orjson.dumps(token_payload))
+        return (signing_input + b"." + _b64url_encode(_sign(signing_input))).decode()
 
     @staticmethod
     def verify_token(token: str) -> Dict[str, Any]:
+        key = blake2b(token.encode(), digest_size=16).digest()
+        cached = _verified_tokens.get(key)
+        if cached is not None:
+            if cached.get("exp", 0) > time.time():
+                return dict(cached)
+            _verified_tokens.pop(key, None)
+
         try:
-            decoded = jwt.decode(
-                token,
-                JWT_SECRET,
-                algorithms=[JWT_ALGORITHM],
-            )
-            logger.info(f"Successfully verified JWT token for user: {decoded.get('id', 'unknown')}")
-            return decoded
-        except jwt.ExpiredSignatureError:
-            logger.warning("Attempt to use expired JWT token")
-            raise ValueError("Token expired")
-        except jwt.InvalidTokenError as e:
+            signing_input, _, signature = token.encode().rpartition(b".")
+            header_segment, _, payload_segment = signing_input.partition(b".")
+            if not header_segment or not payload_segment or b"." in payload_segment:
+                raise ValueError("Not enough segments")
+
+            header = orjson.loads(_b64url_decode(header_segment))
+            if not isinstance(header, dict) or header.get("alg") != JWT_ALGORITHM:
+                raise ValueError("The specified alg value is not allowed")
+            if not hmac.compare_digest(_b64url_decode(signature), _sign(signing_input)):
+                raise ValueError("Signature verification failed")
+
+            decoded = orjson.loads(_b64url_decode(payload_segment))
+            if not isinstance(decoded, dict):
+                raise ValueError("Invalid payload")
+            exp = decoded.get("exp")
+            if exp is not None and not isinstance(exp, (int, float)):
+                raise ValueError("Expiration Time claim (exp) must be a number")
+        except (ValueError, binascii.Error, orjson.JSONDecodeError) as e:
             logger.error(f"Invalid JWT token: {str(e)}")
             raise ValueError("Invalid token")
+
+        if exp is not None and exp <= time.time():
+            logger.warning("Attempt to use expired JWT token")
+            raise ValueError("Token expired")
+
+        logger.info(f"Successfully verified JWT token for user: {decoded.get('id', 'unknown')}")
+        _verified_tokens[key] = decoded
+        return dict(decoded)
@@ -1,17 +1,52 @@
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
 import bcrypt
+from argon2 import PasswordHasher
+from argon2.exceptions import InvalidHashError, VerificationError
+
+
+# Argon2id with the OWASP "interactive" profile (19 MiB, 2 passes)
+_PH = PasswordHasher(time_cost=2, memory_cost=19456, parallelism=1)
+
+# Hashes created before the switch to Argon2id
+_BCRYPT_PREFIXES = ("$2a$", "$2b$", "$2y$")
+
+# Dedicated pool for password hashing. Both argon2 and bcrypt release the GIL,
+# so one thread per core keeps every core busy without starving the default threadpool
+PASSWORD_POOL = ThreadPoolExecutor(
+    max_workers=os.cpu_count() or 1,
+    thread_name_prefix="password"
+)
 
 
 class PasswordService:
     @staticmethod
     def hash_password(password: str) -> str:
-        return bcrypt.hashpw(
-            password.encode(),
-            bcrypt.gensalt()
-        ).decode()
+        return _PH.hash(password)
 
     @staticmethod
     def verify_password(password: str, hashed: str) -> bool:
-        return bcrypt.checkpw(
-            password.encode(),
-            hashed.encode()
-        )
+        if hashed.startswith(_BCRYPT_PREFIXES):
+            return bcrypt.checkpw(
+                password.encode(),
+                hashed.encode()
+            )
+
+        try:
+            return _PH.verify(hashed, password)
+        # VerificationError covers both a wrong password and a corrupted hash
+        except (VerificationError, InvalidHashError):
+            return False
+
+    @staticmethod
+    async def hash_password_async(password: str) -> str:
+        """Hash on PASSWORD_POOL so the event loop stays free"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(PASSWORD_POOL, PasswordService.hash_password, password)
+
+    @staticmethod
+    async def verify_password_async(password: str, hashed: str) -> bool:
+        """Verify on PASSWORD_POOL so the event loop stays free"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(PASSWORD_POOL, PasswordService.verify_password, password, hashed)
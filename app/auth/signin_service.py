@@ -1,35 +1,56 @@
+from cachetools import TTLCache
 from sqlmodel import select
+from sqlalchemy.orm import raiseload
 from app.models.user import User
 from .password_service import PasswordService
 from .jwt_service import JWTService
-from sqlmodel import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 
-def signin_user(db: Session, email: str, password: str):
+# Recently looked-up accounts: email -> (id, hashed_password, name)
+_user_cache: TTLCache = TTLCache(maxsize=2048, ttl=30)
+
+
+async def _find_user(db: AsyncSession, email: str):
+    cached = _user_cache.get(email)
+    if cached is not None:
+        return cached
+
+    statement = select(User).options(raiseload("*", sql_only=True)).where(User.email == email)
+    user = (await db.execute(statement)).scalars().first()
+    if not user:
+        return None
+
+    cached = (str(user.id), user.hashed_password, user.name)
+    _user_cache[email] = cached
+    return cached
+
+
+async def signin_user(db: AsyncSession, email: str, password: str):
     # Find user by email
-    statement = select(User).where(User.email == email)
-    result = db.execute(statement)
-    user = result.first()
+    user = await _find_user(db, email)
 
     if not user:
         raise ValueError("Signin failed")
 
+    user_id, hashed_password, name = user
+
     # Verify password
-    if not PasswordService.verify_password(password, user.hashed_password):
+    if not await PasswordService.verify_password_async(password, hashed_password):
         raise ValueError("Signin failed")
 
     # Create JWT token
     token = JWTService.create_token({
-        "id": str(user.id),
-        "user_id": str(user.id),
-        "email": user.email,
+        "id": user_id,
+        "user_id": user_id,
+        "email": email,
     })
 
     return {
         "access_token": token,
         "user": {
-            "id": str(user.id),
-            "email": user.email,
-            "name": user.name
+            "id": user_id,
+            "email": email,
+            "name": name
         }
     }
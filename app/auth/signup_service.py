@@ -1,44 +1,60 @@
-from sqlmodel import select
+import logging
+import uuid
+from sqlalchemy.exc import IntegrityError
 from app.models.user import User
 from .password_service import PasswordService
 from .jwt_service import JWTService
-from sqlmodel import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
+logger = logging.getLogger(__name__)
 
-def signup_user(db: Session, full_name: str, email: str, password: str):
-    # Check if user already exists
-    existing_user = db.execute(select(User).where(User.email == email)).first()
-    if existing_user:
-        # Do NOT leak info
-        raise ValueError("Signup failed")
 
+def _is_duplicate_email(error: IntegrityError) -> bool:
+    """True when the violation is the unique constraint on user.email"""
+    # SQLite: "UNIQUE constraint failed: user.email"
+    # Postgres: 'duplicate key value violates unique constraint "ix_user_email"'
+    message = str(error.orig).lower()
+    return ("unique" in message or "duplicate" in message) and "email" in message
+
+
+async def signup_user(db: AsyncSession, full_name: str, email: str, password: str):
     # Hash the password
-    hashed = PasswordService.hash_password(password)
+    hashed = await PasswordService.hash_password_async(password)
 
-    # Create new user
+    # Create new user; the id is generated here so no refresh is needed after commit
+    user_uuid = uuid.uuid4()
+    user_id = str(user_uuid)
     user = User(
+        id=user_uuid,
         name=full_name,
         email=email,
         hashed_password=hashed
     )
 
-    # Add user to database
+    # Add user to database; the unique email constraint rejects existing users
     db.add(user)
-    db.commit()
-    db.refresh(user)
+    try:
+        await db.commit()
+    except IntegrityError as e:
+        await db.rollback()
+        if not _is_duplicate_email(e):
+            logger.exception("Unexpected integrity error during signup")
+            raise
+        # Do NOT leak info
+        raise ValueError("Signup failed")
 
     # Create JWT token
     token = JWTService.create_token({
-        "id": str(user.id),
-        "user_id": str(user.id),
-        "email": user.email,
+        "id": user_id,
+        "user_id": user_id,
+        "email": email,
     })
 
     return {
         "access_token": token,
         "user": {
-            "id": str(user.id),
-            "email": user.email,
-            "name": user.name
+            "id": user_id,
+            "email": email,
+            "name": full_name
         }
     }
@@ -0,0 +1,83 @@
+"""
+Application Settings
+
+This module reads configuration from the environment (and `.env`) once at
+import time and exposes it as a typed, immutable `settings` object.
+"""
+
+from typing import List, Optional
+from typing_extensions import Annotated
+from pydantic import AliasChoices, Field, field_validator, model_validator
+from pydantic_settings import BaseSettings, NoDecode, SettingsConfigDict
+
+
+class Settings(BaseSettings):
+    """Typed view of the environment variables used by the application"""
+    model_config = SettingsConfigDict(env_file=".env", extra="ignore", frozen=True)
+
+    environment: str = "development"
+    host: str = "0.0.0.0"
+    port: int = 7860
+    # Worker processes for `python -m app.main`; defaults to one per CPU
+    web_concurrency: Optional[int] = None
+
+    # Empty means local SQLite; usually carries the database password
+    database_url: str = Field(default="", repr=False)
+    db_pool_size: int = 20
+    db_max_overflow: int = 40
+    db_pool_min: int = 5
+    # Prepared statements cached per asyncpg connection
+    db_statement_cache_size: int = 500
+    # Set when DATABASE_URL points at a transaction-pooling PgBouncer: disables
+    # the statement caches, names statements uniquely and skips startup
+    # parameters PgBouncer does not forward
+    db_pgbouncer: bool = False
+    sql_echo: bool = False
+    # Create missing tables/indexes at startup; turn off once the schema is
+    # managed outside the app
+    db_init_schema: bool = True
+    # Statements slower than this are logged; 0 turns the check off
+    slow_query_ms: int = 50
+
+    # Comma-separated list; empty allows every origin
+    allowed_origins: Annotated[List[str], NoDecode] = ["*"]
+    allow_origin_regex: Optional[str] = None
+    # How long browsers may reuse a preflight response, in seconds
+    cors_max_age: int = 86400
+
+    # Use Better Auth secret if available, fallback to JWT_SECRET
+    jwt_secret: str = Field(
+        default="CHANGE_THIS_TO_ENV_SECRET",
+        validation_alias=AliasChoices("BETTER_AUTH_SECRET", "JWT_SECRET"),
+        repr=False,
+    )
+    # Token expiration: 24 hours in production, 1 hour in development
+    jwt_expires_in: Optional[int] = None
+
+    openai_api_key: Optional[str] = Field(default=None, repr=False)
+    openai_model: str = "gpt-4"
+
+    rag_engine_url: str = "http://localhost:7860"
+    mcp_base_url: str = "http://localhost:3000/mcp"
+
+    @property
+    def is_production(self) -> bool:
+        return self.environment == "production"
+
+    @field_validator("allowed_origins", mode="before")
+    @classmethod
+    def _split_origins(cls, value):
+        if isinstance(value, str):
+            origins = [origin.strip() for origin in value.split(",") if origin.strip()]
+            return origins or ["*"]
+        return value
+
+    @model_validator(mode="after")
+    def _default_jwt_expiry(self) -> "Settings":
+        if self.jwt_expires_in is None:
+            expires_in = 24 * 60 * 60 if self.is_production else 60 * 60
+            object.__setattr__(self, "jwt_expires_in", expires_in)
+        return self
+
+
+settings = Settings()
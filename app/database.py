@@ -1,48 +1,258 @@
-import os
-from dotenv import load_dotenv
-from sqlmodel import SQLModel, create_engine
-from contextlib import contextmanager
-from typing import Generator
-from sqlalchemy.orm import sessionmaker
+import asyncio
+import time
+import uuid
+from sqlmodel import SQLModel
+from typing import AsyncGenerator
+from sqlalchemy import event, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 import logging
+from app.config import settings
 
 logger = logging.getLogger(__name__)
 
-# Load environment variables
-load_dotenv()
-
 # Use DATABASE_URL if set and not empty, otherwise default to local SQLite
-temp_db_url = os.getenv("DATABASE_URL", "")
-if not temp_db_url or temp_db_url.strip() == "":
-    DATABASE_URL = "sqlite:///./todo.db"
-else:
-    DATABASE_URL = temp_db_url
+DATABASE_URL = settings.database_url.strip() or "sqlite:///./todo.db"
 
 # Validate the DATABASE_URL and fall back to SQLite if it's invalid
 try:
-    from sqlalchemy.engine import make_url
     make_url(DATABASE_URL)
 except Exception as e:
     logger.warning(f"Invalid DATABASE_URL '{DATABASE_URL}', falling back to SQLite: {e}")
     DATABASE_URL = "sqlite:///./todo.db"
 
-# SQLite requires this argument; other DBs don't
-connect_args = {"check_same_thread": False} if DATABASE_URL.startswith("sqlite") else {}
+def _async_url(database_url: str):
+    """Map a sync DATABASE_URL onto its async driver (asyncpg / aiosqlite)"""
+    url = make_url(database_url)
+    connect_args = {}
+    if url.get_backend_name() == "sqlite":
+        url = url.set(drivername="sqlite+aiosqlite")
+    elif url.get_backend_name() in ("postgresql", "postgres"):
+        # asyncpg takes the libpq sslmode as its `ssl` argument and rejects
+        # libpq-only query parameters
+        query = dict(url.query)
+        sslmode = query.pop("sslmode", None)
+        query.pop("channel_binding", None)
+        if sslmode:
+            connect_args["ssl"] = sslmode
+        # now() is written into naive timestamp columns, so pin it to UTC
+        server_settings = {"application_name": "todoapp", "timezone": "UTC"}
+        if settings.db_pgbouncer:
+            # Statements may run on a different server connection each
+            # transaction, so nothing can be cached and names must never repeat
+            connect_args["prepared_statement_cache_size"] = 0
+            connect_args["statement_cache_size"] = 0
+            connect_args["prepared_statement_name_func"] = lambda: f"__asyncpg_{uuid.uuid4()}__"
+        else:
+            # Reuse parsed statements and server-side plans across requests; JIT
+            # compilation costs more than it saves on short OLTP queries.
+            # PgBouncer rejects `jit` as a startup parameter
+            connect_args["prepared_statement_cache_size"] = settings.db_statement_cache_size
+            connect_args["statement_cache_size"] = settings.db_statement_cache_size
+            server_settings["jit"] = "off"
+        connect_args["server_settings"] = server_settings
+        url = url.set(drivername="postgresql+asyncpg", query=query)
+    return url, connect_args
+
+ASYNC_DATABASE_URL, connect_args = _async_url(DATABASE_URL)
+
+# SQLite uses its default pool; other DBs get an explicitly sized connection pool
+if DATABASE_URL.startswith("sqlite"):
+    engine_kwargs = {}
+else:
+    engine_kwargs = {
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_pre_ping": True,
+        "pool_recycle": 1800,
+        # Reuse the most recently returned connection so idle ones can be recycled
+        "pool_use_lifo": True,
+    }
+
+# Create engine and session; set SQL_ECHO=1 to log every statement
+engine = create_async_engine(
+    ASYNC_DATABASE_URL,
+    echo=settings.sql_echo,
+    connect_args=connect_args,
+    **engine_kwargs
+)
+if DATABASE_URL.startswith("sqlite"):
+    @event.listens_for(engine.sync_engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        # WAL lets readers run alongside the writer; NORMAL sync is safe under WAL
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA cache_size=-65536")
+        cursor.execute("PRAGMA mmap_size=268435456")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.close()
 
-# Create engine and session
-engine = create_engine(DATABASE_URL, echo=True, connect_args=connect_args)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Log slow statements instead of echoing every one; SQL_ECHO stays available for debugging
+if settings.slow_query_ms > 0:
+    _slow_query_seconds = settings.slow_query_ms / 1000
 
-def init_db():
+    # The start time lives on the per-execution context, so a statement that
+    # raises leaves nothing behind on the pooled connection
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def _start_query_timer(conn, cursor, statement, parameters, context, executemany):
+        context._query_start_time = time.perf_counter()
+
+    @event.listens_for(engine.sync_engine, "after_cursor_execute")
+    def _log_slow_query(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - context._query_start_time
+        if elapsed > _slow_query_seconds:
+            logger.warning(f"Slow query ({elapsed * 1000:.1f} ms): {statement}")
+
+# Objects stay usable after commit; reloading them would need an implicit await
+SessionLocal = async_sessionmaker(engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
+# Arbitrary key for the advisory lock that serializes schema setup across workers
+_SCHEMA_LOCK_ID = 72_361_004
+
+async def init_db():
     """Create database tables based on SQLModel metadata"""
+    if not settings.db_init_schema:
+        logger.info("DB_INIT_SCHEMA is off; skipping schema setup")
+        return
     logger.info("Initializing database tables...")
-    SQLModel.metadata.create_all(engine)
+    async with engine.begin() as conn:
+        if engine.dialect.name == "postgresql":
+            # Workers starting together would otherwise race on CREATE TABLE/INDEX;
+            # the lock is released when this transaction ends
+            await conn.execute(text("SELECT pg_advisory_xact_lock(:id)"), {"id": _SCHEMA_LOCK_ID})
+        await conn.run_sync(SQLModel.metadata.create_all)
+        # create_all skips tables that already exist, so add any indexes they lack
+        await conn.run_sync(_create_missing_indexes)
+        await _drop_superseded_indexes(conn)
+        if engine.dialect.name == "postgresql":
+            await _migrate_user_id(conn)
+            await _migrate_timestamp_defaults(conn)
+            await _migrate_task_priority(conn)
+            await _create_search_index(conn)
+        elif await _is_legacy_sqlite_task_table(conn):
+            # Rows written before ck_task_priority; tables created since are already clean
+            await _normalize_sqlite_timestamps(conn)
+            await _normalize_task_priorities(conn)
     logger.info("Database tables initialized successfully")
 
-def get_session():
-    """Dependency for providing database sessions"""
-    db = SessionLocal()
+def _create_missing_indexes(conn):
+    for table in SQLModel.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(conn, checkfirst=True)
+
+# Indexes earlier versions created that newer ones cover; they only add write cost
+_SUPERSEDED_INDEXES = (
+    "ix_task_user_id",  # every composite task index leads with user_id
+    "ix_task_user_created",  # replaced by ix_task_user_created_id
+)
+
+async def _drop_superseded_indexes(conn):
+    for name in _SUPERSEDED_INDEXES:
+        await conn.execute(text(f"DROP INDEX IF EXISTS {name}"))
+
+async def _migrate_user_id(conn):
+    """Convert a legacy VARCHAR `user.id` column to the native uuid type"""
+    data_type = (await conn.execute(text(
+        "SELECT data_type FROM information_schema.columns "
+        "WHERE table_schema = current_schema() AND table_name = 'user' AND column_name = 'id'"
+    ))).scalar()
+    if data_type == "character varying":
+        logger.info("Converting user.id to uuid...")
+        await conn.execute(text('ALTER TABLE "user" ALTER COLUMN id TYPE uuid USING id::uuid'))
+
+async def _migrate_timestamp_defaults(conn):
+    """Give legacy timestamp columns the server default that INSERTs now rely on"""
+    columns = (("task", "created_at"), ("task", "updated_at"), ("user", "createdAt"), ("user", "updatedAt"))
+    for table, column in columns:
+        default = (await conn.execute(text(
+            "SELECT column_default FROM information_schema.columns "
+            "WHERE table_schema = current_schema() AND table_name = :table AND column_name = :column"
+        ), {"table": table, "column": column})).scalar()
+        if default is None:
+            logger.info(f"Adding server default to {table}.{column}...")
+            await conn.execute(text(f'ALTER TABLE "{table}" ALTER COLUMN "{column}" SET DEFAULT now()'))
+
+async def _migrate_task_priority(conn):
+    """Convert the legacy native enum `task.priority` column to varchar + CHECK"""
+    data_type = (await conn.execute(text(
+        "SELECT data_type FROM information_schema.columns "
+        "WHERE table_schema = current_schema() AND table_name = 'task' AND column_name = 'priority'"
+    ))).scalar()
+    if data_type == "USER-DEFINED":
+        logger.info("Converting task.priority to varchar...")
+        # The enum stored member names (LOW/MEDIUM/HIGH); the column now holds the values
+        await conn.execute(text(
+            "ALTER TABLE task ALTER COLUMN priority TYPE varchar(8) USING lower(priority::text)"
+        ))
+        await conn.execute(text("UPDATE task SET priority = 'medium' WHERE priority IS NULL"))
+        await conn.execute(text(
+            "ALTER TABLE task ALTER COLUMN priority SET DEFAULT 'medium', "
+            "ALTER COLUMN priority SET NOT NULL, "
+            "ADD CONSTRAINT ck_task_priority CHECK (priority IN ('low', 'medium', 'high'))"
+        ))
+        await conn.execute(text("DROP TYPE IF EXISTS taskpriority"))
+
+async def _is_legacy_sqlite_task_table(conn) -> bool:
+    """True for a SQLite task table created before ck_task_priority existed"""
+    ddl = (await conn.execute(text(
+        "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'task'"
+    ))).scalar()
+    return ddl is not None and "ck_task_priority" not in ddl
+
+async def _normalize_sqlite_timestamps(conn):
+    """Drop the fractional seconds older rows were stored with"""
+    # Keyset cursors are bound at second resolution; a stored "...10.327557"
+    # would sort after a "...10" cursor and be skipped
+    for column in ("created_at", "updated_at"):
+        await conn.execute(text(
+            f"UPDATE task SET {column} = substr({column}, 1, 19) WHERE length({column}) > 19"
+        ))
+
+async def _normalize_task_priorities(conn):
+    """Rewrite legacy enum member names (LOW/MEDIUM/HIGH) and NULLs to the stored values
+
+    Postgres does this while converting the enum column in _migrate_task_priority.
+    """
+    await conn.execute(text(
+        "UPDATE task SET priority = lower(priority) WHERE priority IN ('LOW', 'MEDIUM', 'HIGH')"
+    ))
+    await conn.execute(text("UPDATE task SET priority = 'medium' WHERE priority IS NULL"))
+
+async def _create_search_index(conn):
+    """Create the full-text index that serves title searches on Postgres"""
     try:
+        # A savepoint keeps a failure here from aborting the rest of schema setup
+        async with conn.begin_nested():
+            await conn.execute(text(
+                "CREATE INDEX IF NOT EXISTS ix_task_title_fts "
+                "ON task USING gin (to_tsvector('english', title))"
+            ))
+            # Superseded by the full-text index; only adds write cost now
+            await conn.execute(text("DROP INDEX IF EXISTS ix_task_title_trgm"))
+    except Exception as e:
+        logger.warning(f"Could not create full-text index on task.title: {e}")
+
+async def warm_pool():
+    """Open DB_POOL_MIN connections up front so the first requests skip the connect handshake"""
+    if DATABASE_URL.startswith("sqlite"):
+        return
+    size = min(settings.db_pool_min, engine.sync_engine.pool.size())
+    conns = await asyncio.gather(
+        *(engine.connect().start() for _ in range(size)),
+        return_exceptions=True
+    )
+    opened = 0
+    for conn in conns:
+        if isinstance(conn, Exception):
+            logger.warning(f"Could not pre-open database connection: {conn}")
+        else:
+            opened += 1
+            await conn.close()
+    logger.info(f"Warmed database pool with {opened} connections")
+
+async def get_session() -> AsyncGenerator[AsyncSession, None]:
+    """Dependency for providing database sessions"""
+    async with SessionLocal() as db:
         yield db
-    finally:
-        db.close()
@@ -1,32 +1,51 @@
 import os
 import logging
+from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from app.api.tasks import router as tasks_router
 from app.api.auth import router as auth_router
 from app.api.chatbot import router as chatbot_router
-from app.database import init_db
+from app.config import settings
+from app.database import init_db, warm_pool
+from app.services.mcp_client import get_mcp_client
+from app.services.rag_client import get_rag_client
 import uvicorn
-import traceback
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    logger.info("Initializing database...")
+    await init_db()
+    await warm_pool()
+    logger.info("Database initialized successfully")
+    # Create the shared outbound HTTP clients before the first request needs them;
+    # callers always go through the getters, which replace a closed client
+    rag_client = get_rag_client()
+    mcp_client = get_mcp_client()
+    yield
+    await rag_client.close()
+    await mcp_client.close()
+
+
 app = FastAPI(
     title="Todo API",
     version="1.0.0",
-    docs_url="/docs" if os.getenv("ENVIRONMENT") != "production" else None,
-    redoc_url="/redoc" if os.getenv("ENVIRONMENT") != "production" else None
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
+    docs_url=None if settings.is_production else "/docs",
+    redoc_url=None if settings.is_production else "/redoc"
 )
 
-# Configure CORS based on environment
-allow_origins_str = os.getenv("ALLOWED_ORIGINS", "")
-if allow_origins_str:
-    allow_origins = [origin.strip() for origin in allow_origins_str.split(",")]
-else:
-    allow_origins = ["*"]  # Default to allow all in development
+# Configure CORS based on environment; ALLOWED_ORIGINS defaults to all origins.
+# Requests without an Origin header pass straight through the middleware, and a
+# frozenset makes the per-request origin check a hash lookup
+allow_origins = frozenset(settings.allowed_origins)
 
 if "*" in allow_origins:
     # If wildcard is used, allow credentials is not allowed
@@ -36,6 +55,7 @@ if "*" in allow_origins:
         allow_credentials=False,  # Set to False when allowing all origins
         allow_methods=["*"],
         allow_headers=["*"],
+        max_age=settings.cors_max_age,
     )
 else:
     app.add_middleware(
@@ -44,7 +64,8 @@ else:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
-        allow_origin_regex=os.getenv("ALLOW_ORIGIN_REGEX"),
+        allow_origin_regex=settings.allow_origin_regex,
+        max_age=settings.cors_max_age,
     )
 
 # Include API routers
@@ -52,11 +73,6 @@ app.include_router(auth_router, prefix="/api")
 app.include_router(tasks_router, prefix="/api")
 app.include_router(chatbot_router, prefix="/api")
 
-@app.on_event("startup")
-def on_startup():
-    logger.info("Initializing database...")
-    init_db()
-    logger.info("Database initialized successfully")
 
 @app.get("/")
 def read_root():
@@ -64,28 +80,33 @@ def read_root():
 
 @app.get("/health")
 def health_check():
-    return {"status": "healthy", "environment": os.getenv("ENVIRONMENT", "development")}
+    return {"status": "healthy", "environment": settings.environment}
 
 # Debug endpoint to test functionality (only available in non-production environments)
-if os.getenv("ENVIRONMENT") != "production":
+if not settings.is_production:
     @app.post("/api/debug/signup")
-    def debug_signup(full_name: str, email: str, password: str):
+    async def debug_signup(full_name: str, email: str, password: str):
         from app.auth.signup_service import signup_user
-        from app.database import get_session
-        try:
-            gen = get_session()
-            db = next(gen)
-            result = signup_user(db, full_name, email, password)
-            next(gen, None)  # Close the session
-            return result
-        except Exception as e:
-            next(gen, None)  # Close the session
-            print(f"Debug signup error: {e}")
-            traceback.print_exc()
-            return {"error": str(e)}
+        from app.database import SessionLocal
+        async with SessionLocal() as db:
+            try:
+                return await signup_user(db, full_name, email, password)
+            except Exception as e:
+                logger.exception("Debug signup error")
+                return {"error": str(e)}
 
 if __name__ == "__main__":
-    port = int(os.getenv("PORT", 7860))
-    host = os.getenv("HOST", "0.0.0.0")
-    reload = os.getenv("ENVIRONMENT") != "production"
-    uvicorn.run("app.main:app", host=host, port=port, reload=reload)
\ No newline at end of file
+    # Auto-reload only outside production, and it runs a single process
+    reload = not settings.is_production
+    log_level = "info" if reload else "warning"
+    workers = 1 if reload else settings.web_concurrency or os.cpu_count() or 1
+    uvicorn.run(
+        "app.main:app",
+        host=settings.host,
+        port=settings.port,
+        reload=reload,
+        workers=workers,
+        loop="uvloop",
+        http="httptools",
+        log_level=log_level,
+    )
\ No newline at end of file
@@ -1,29 +1,67 @@
 from sqlmodel import SQLModel, Field, Relationship
-from typing import Optional
-from datetime import datetime, timezone
+from typing import Literal, Optional
+from datetime import datetime
 import uuid
 from enum import Enum
-from sqlalchemy import Column, Enum as SQLAlchemyEnum
+from sqlalchemy import CheckConstraint, Column, DateTime, Index, String, func
+from sqlalchemy.dialects.sqlite import DATETIME as SQLiteDateTime
+
+# SQLite's CURRENT_TIMESTAMP has no fractional seconds; bind datetimes in the
+# same format so keyset comparisons on created_at line up with stored values
+_Timestamp = DateTime().with_variant(
+    SQLiteDateTime(storage_format="%(year)04d-%(month)02d-%(day)02d %(hour)02d:%(minute)02d:%(second)02d"),
+    "sqlite"
+)
 
 class TaskPriority(str, Enum):
     LOW = "low"
     MEDIUM = "medium"
     HIGH = "high"
 
+# Fields hold the plain string values; TaskPriority names the levels in code
+PriorityLevel = Literal["low", "medium", "high"]
+
 class TaskBase(SQLModel):
     title: str = Field(index=True, min_length=1, max_length=100)
     description: Optional[str] = None
     is_completed: bool = Field(default=False)
-    priority: TaskPriority = Field(
-        default=TaskPriority.MEDIUM,
-        sa_column=Column(SQLAlchemyEnum(TaskPriority, native_enum=True))
+    # Stored as plain text so reads skip enum conversion and new levels need no type DDL
+    priority: PriorityLevel = Field(
+        default=TaskPriority.MEDIUM.value,
+        sa_column=Column(
+            String(8),
+            CheckConstraint("priority IN ('low', 'medium', 'high')", name="ck_task_priority"),
+            nullable=False,
+            server_default=TaskPriority.MEDIUM.value
+        )
     )
 
 class Task(TaskBase, table=True):
+    # Every query is scoped to one user, so user_id leads each index; a btree on
+    # (user_id, created_at, id) serves ORDER BY created_at DESC, id DESC and the
+    # (created_at, id) keyset cursor via a backward scan
+    __table_args__ = (
+        Index("ix_task_user_created_id", "user_id", "created_at", "id"),
+        Index("ix_task_user_completed", "user_id", "is_completed"),
+        Index("ix_task_user_priority", "user_id", "priority"),
+    )
+
+    # Timestamps are filled in by the database; eager_defaults reads them back
+    # with RETURNING as part of the INSERT/UPDATE instead of a later SELECT.
+    # The SQL-side `default` keeps INSERTs working on tables created before the
+    # server default existed, which SQLite cannot add in place
+    __mapper_args__ = {"eager_defaults": True}
+
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
-    user_id: uuid.UUID = Field(index=True)
-    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
-    updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    user_id: uuid.UUID
+    created_at: Optional[datetime] = Field(
+        default=None,
+        sa_column=Column(_Timestamp, default=func.now(), server_default=func.now(), nullable=False)
+    )
+    updated_at: Optional[datetime] = Field(
+        default=None,
+        sa_column=Column(_Timestamp, default=func.now(), server_default=func.now(), onupdate=func.now(), nullable=False)
+    )
 
 class TaskCreate(TaskBase):
     pass
@@ -32,5 +70,4 @@ class TaskUpdate(SQLModel):
     title: Optional[str] = None
     description: Optional[str] = None
     is_completed: Optional[bool] = None
-    priority: Optional[TaskPriority] = None
-    updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    priority: Optional[PriorityLevel] = None
@@ -1,15 +1,22 @@
 from sqlmodel import SQLModel, Field
+from sqlalchemy import Column, DateTime, func
 from typing import Optional
 from datetime import datetime
 import uuid
 
 class User(SQLModel, table=True):
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()), primary_key=True)
+    id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     email: str = Field(unique=True, index=True)
     name: str
     hashed_password: str
-    createdAt: datetime = Field(default_factory=datetime.utcnow)
-    updatedAt: datetime = Field(default_factory=datetime.utcnow)
+    createdAt: Optional[datetime] = Field(
+        default=None,
+        sa_column=Column(DateTime, default=func.now(), server_default=func.now(), nullable=False)
+    )
+    updatedAt: Optional[datetime] = Field(
+        default=None,
+        sa_column=Column(DateTime, default=func.now(), server_default=func.now(), onupdate=func.now(), nullable=False)
+    )
     emailVerified: bool = Field(default=False)  # Set default to False instead of None
     image: Optional[str] = Field(default=None)
 
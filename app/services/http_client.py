@@ -0,0 +1,31 @@
+"""
+Shared HTTP Client Factory
+
+Builds the pooled HTTP/2 client used by the outbound service clients
+(RAG engine, MCP tools).
+"""
+
+import httpx
+
+
+def create_http2_client() -> httpx.AsyncClient:
+    """
+    Create an AsyncClient with a pooled HTTP/2 transport.
+
+    Returns:
+        httpx.AsyncClient instance
+    """
+    # HTTP/2 multiplexes concurrent calls over one connection; the transport
+    # owns the pool, so http2/limits/retries are all configured there
+    return httpx.AsyncClient(
+        timeout=httpx.Timeout(30.0, connect=2.0),  # 30-second timeout for API calls
+        transport=httpx.AsyncHTTPTransport(
+            http2=True,
+            limits=httpx.Limits(
+                max_connections=200,
+                max_keepalive_connections=100,
+                keepalive_expiry=60
+            ),
+            retries=1
+        )
+    )
@@ -9,10 +9,15 @@ import asyncio
 from typing import Dict, Any, Optional, List
 from pydantic import BaseModel
 import logging
+from app.config import settings
+from app.services.http_client import create_http2_client
 import httpx
+import orjson
 
 logger = logging.getLogger(__name__)
 
+_JSON_HEADERS = {"content-type": "application/json"}
+
 
 class MCPCallResult(BaseModel):
     """Result of an MCP call"""
@@ -38,7 +43,7 @@ class MCPClient:
             base_url: Base URL of the MCP service
         """
         self.base_url = base_url.rstrip('/')
-        self.client = httpx.AsyncClient(timeout=30.0)  # 30-second timeout for API calls
+        self.client = create_http2_client()
 
     async def close(self):
         """Close the HTTP client connection pool."""
@@ -71,10 +76,10 @@ class MCPClient:
         }
 
         try:
-            response = await self.client.post(url, json=payload)
+            response = await self.client.post(url, content=orjson.dumps(payload), headers=_JSON_HEADERS)
             response.raise_for_status()
 
-            data = response.json()
+            data = orjson.loads(response.content)
             return MCPCallResult(success=True, data=data)
         except httpx.HTTPStatusError as e:
             logger.error(f"HTTP error occurred while calling MCP tool {tool_name}: {e.response.status_code} - {e.response.text}")
@@ -99,7 +104,7 @@ class MCPClient:
             response = await self.client.get(url)
             response.raise_for_status()
 
-            data = response.json()
+            data = orjson.loads(response.content)
             return MCPCallResult(success=True, data=data)
         except Exception as e:
             logger.error(f"Error getting available MCP tools: {str(e)}")
@@ -118,7 +123,7 @@ class MCPClient:
             response = await self.client.get(url)
             response.raise_for_status()
 
-            data = response.json()
+            data = orjson.loads(response.content)
             return data.get("status") == "healthy"
         except:
             return False
@@ -136,9 +141,6 @@ def get_mcp_client() -> MCPClient:
         MCPClient instance
     """
     global _mcp_client
-    if _mcp_client is None:
-        # Get base URL from environment or use default
-        import os
-        mcp_base_url = os.getenv("MCP_BASE_URL", "http://localhost:3000/mcp")
-        _mcp_client = MCPClient(base_url=mcp_base_url)
+    if _mcp_client is None or _mcp_client.client.is_closed:
+        _mcp_client = MCPClient(base_url=settings.mcp_base_url)
     return _mcp_client
\ No newline at end of file
@@ -6,13 +6,18 @@ RAG Chatbot Engine via HTTP API calls.
 """
 
 import httpx
+import orjson
 import asyncio
 from typing import Dict, Any, Optional, List
 from pydantic import BaseModel
 import logging
+from app.config import settings
+from app.services.http_client import create_http2_client
 
 logger = logging.getLogger(__name__)
 
+_JSON_HEADERS = {"content-type": "application/json"}
+
 
 class RAGQueryResponse(BaseModel):
     """Response model for RAG queries"""
@@ -40,7 +45,7 @@ class RAGClient:
             base_url: Base URL of the RAG Chatbot Engine API
         """
         self.base_url = base_url.rstrip('/')
-        self.client = httpx.AsyncClient(timeout=30.0)  # 30-second timeout for API calls
+        self.client = create_http2_client()
 
     async def close(self):
         """Close the HTTP client connection pool."""
@@ -80,10 +85,10 @@ class RAGClient:
         }
 
         try:
-            response = await self.client.post(url, json=payload)
+            response = await self.client.post(url, content=orjson.dumps(payload), headers=_JSON_HEADERS)
             response.raise_for_status()
 
-            data = response.json()
+            data = orjson.loads(response.content)
             return RAGQueryResponse(**data)
         except httpx.HTTPStatusError as e:
             logger.error(f"HTTP error occurred while querying RAG: {e.response.status_code} - {e.response.text}")
@@ -120,10 +125,10 @@ class RAGClient:
         }
 
         try:
-            response = await self.client.post(url, json=payload)
+            response = await self.client.post(url, content=orjson.dumps(payload), headers=_JSON_HEADERS)
             response.raise_for_status()
 
-            return response.json()
+            return orjson.loads(response.content)
         except httpx.HTTPStatusError as e:
             logger.error(f"HTTP error occurred while ingesting text: {e.response.status_code} - {e.response.text}")
             raise
@@ -150,7 +155,7 @@ class RAGClient:
             response = await self.client.get(url)
             response.raise_for_status()
 
-            return response.json()
+            return orjson.loads(response.content)
         except httpx.HTTPStatusError as e:
             logger.error(f"HTTP error occurred while getting project stats: {e.response.status_code} - {e.response.text}")
             raise
@@ -174,7 +179,7 @@ class RAGClient:
             response = await self.client.get(url)
             response.raise_for_status()
 
-            data = response.json()
+            data = orjson.loads(response.content)
             return data.get("status") == "healthy"
         except:
             return False
@@ -192,9 +197,6 @@ def get_rag_client() -> RAGClient:
         RAGClient instance
     """
     global _rag_client
-    if _rag_client is None:
-        # Get base URL from environment or use default
-        import os
-        rag_base_url = os.getenv("RAG_ENGINE_URL", "http://localhost:7860")
-        _rag_client = RAGClient(base_url=rag_base_url)
+    if _rag_client is None or _rag_client.client.is_closed:
+        _rag_client = RAGClient(base_url=settings.rag_engine_url)
     return _rag_client
\ No newline at end of file
@@ -1,103 +1,153 @@
-from sqlmodel import Session, select, col
-from typing import List, Optional
+from sqlmodel import select, col
+from sqlalchemy import case, delete, func, lambda_stmt, literal_column, tuple_, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import raiseload
+from datetime import datetime
+from typing import List, Optional, Tuple
 import uuid
-from datetime import datetime, timezone
 from app.models.task import Task, TaskCreate, TaskUpdate
 
+# Most urgent first; a plain text sort would put "high" < "low" < "medium"
+_PRIORITY_RANK = case({"high": 0, "medium": 1}, value=Task.priority, else_=2)
+
+# Inlined rather than bound so the planner can match the ix_task_title_fts expression
+_FTS_CONFIG = literal_column("'english'::regconfig")
+
+def _select_task(task_id: uuid.UUID, user_id: uuid.UUID):
+    """Cached single-task lookup scoped to its owner"""
+    return lambda_stmt(
+        lambda: select(Task)
+        .options(raiseload("*", sql_only=True))
+        .where(Task.id == task_id, Task.user_id == user_id)
+        .limit(1)
+    )
+
 class TaskService:
     @staticmethod
-    def get_tasks(
-        session: Session,
+    async def get_tasks(
+        session: AsyncSession,
         user_id: uuid.UUID,
         status: Optional[str] = None,
         priority: Optional[str] = None,
         search: Optional[str] = None,
-        sort_by: str = "created_at"
+        sort_by: str = "created_at",
+        limit: int = 50,
+        offset: int = 0,
+        cursor: Optional[Tuple[datetime, uuid.UUID]] = None
     ) -> List[Task]:
-        statement = select(Task).where(Task.user_id == user_id)
+        # lambda_stmt caches each statement shape by code location, so repeat
+        # calls skip rebuilding the expression tree; closure values become bind params
+        # raiseload makes any lazy relationship load fail loudly instead of
+        # issuing one extra query per task; load relationships explicitly
+        statement = lambda_stmt(
+            lambda: select(Task).options(raiseload("*", sql_only=True)).where(Task.user_id == user_id)
+        )
 
         if status == "completed":
-            statement = statement.where(Task.is_completed == True)
+            statement += lambda s: s.where(Task.is_completed == True)
         elif status == "pending":
-            statement = statement.where(Task.is_completed == False)
+            statement += lambda s: s.where(Task.is_completed == False)
 
         if priority:
-            statement = statement.where(Task.priority == priority)
+            statement += lambda s: s.where(Task.priority == priority)
 
         if search:
-            statement = statement.where(col(Task.title).ilike(f"%{search}%"))
+            if session.bind.dialect.name == "postgresql":
+                # Matches the expression GIN index ix_task_title_fts
+                statement += lambda s: s.where(
+                    func.to_tsvector(_FTS_CONFIG, Task.title).op("@@")(func.plainto_tsquery(_FTS_CONFIG, search))
+                )
+            else:
+                pattern = f"%{search}%"
+                statement += lambda s: s.where(col(Task.title).ilike(pattern))
 
         # Basic sorting
         if sort_by == "priority":
-            statement = statement.order_by(Task.priority)
+            statement += lambda s: s.order_by(_PRIORITY_RANK, Task.created_at.desc())
         elif sort_by == "title":
-            statement = statement.order_by(Task.title)
+            statement += lambda s: s.order_by(Task.title)
         else:
-            statement = statement.order_by(Task.created_at.desc())
+            # Keyset pagination: resume after the (created_at, id) of the last
+            # task on the previous page instead of skipping rows with OFFSET
+            if cursor:
+                # Built outside the lambda so the cursor binds keep the column types
+                after_cursor = tuple_(Task.created_at, Task.id) < cursor
+                statement += lambda s: s.where(after_cursor)
+            statement += lambda s: s.order_by(Task.created_at.desc(), Task.id.desc())
 
-        return session.execute(statement).all()
+        statement += lambda s: s.limit(limit).offset(offset)
+
+        result = await session.execute(statement)
+        return result.scalars().all()
 
     @staticmethod
-    def create_task(session: Session, task_data: TaskCreate, user_id: uuid.UUID) -> Task:
-        db_task = Task.model_validate(task_data, update={"user_id": user_id})
+    async def create_task(session: AsyncSession, task_data: TaskCreate, user_id: uuid.UUID) -> Task:
+        # task_data was validated at the route; table models take kwargs as-is
+        db_task = Task(**task_data.__dict__, user_id=user_id)
         session.add(db_task)
-        session.commit()
-        session.refresh(db_task)
+        # The INSERT returns the server-side timestamps (eager_defaults) and
+        # objects are not expired on commit, so no refresh SELECT is needed
+        await session.commit()
         return db_task
 
     @staticmethod
-    def update_task(
-        session: Session,
+    async def update_task(
+        session: AsyncSession,
         task_id: uuid.UUID,
         task_data: TaskUpdate,
         user_id: uuid.UUID
     ) -> Optional[Task]:
-        statement = select(Task).where(Task.id == task_id, Task.user_id == user_id)
-        db_task = session.execute(statement).first()
+        statement = _select_task(task_id, user_id)
+        db_task = (await session.execute(statement)).scalar_one_or_none()
         if not db_task:
             return None
 
-        task_dict = task_data.model_dump(exclude_unset=True)
-        for key, value in task_dict.items():
-            setattr(db_task, key, value)
+        for key in task_data.model_fields_set:
+            setattr(db_task, key, getattr(task_data, key))
 
         session.add(db_task)
-        session.commit()
-        session.refresh(db_task)
+        await session.commit()
         return db_task
 
     @staticmethod
-    def get_task_by_id(session: Session, task_id: uuid.UUID, user_id: uuid.UUID) -> Optional[Task]:
-        statement = select(Task).where(Task.id == task_id, Task.user_id == user_id)
-        return session.execute(statement).first()
+    async def get_task_by_id(session: AsyncSession, task_id: uuid.UUID, user_id: uuid.UUID) -> Optional[Task]:
+        statement = _select_task(task_id, user_id)
+        return (await session.execute(statement)).scalar_one_or_none()
 
     @staticmethod
-    def update_task_completion(
-        session: Session,
+    async def update_task_completion(
+        session: AsyncSession,
         task_id: uuid.UUID,
         completed: bool,
         user_id: uuid.UUID
     ) -> Optional[Task]:
-        statement = select(Task).where(Task.id == task_id, Task.user_id == user_id)
-        db_task = session.execute(statement).first()
+        # One UPDATE ... RETURNING round trip where the backend supports it
+        if session.bind.dialect.update_returning:
+            statement = (
+                update(Task)
+                .where(Task.id == task_id, Task.user_id == user_id)
+                .values(is_completed=completed)
+                .returning(Task)
+            )
+            db_task = (await session.execute(statement)).scalar_one_or_none()
+            await session.commit()
+            return db_task
+
+        statement = _select_task(task_id, user_id)
+        db_task = (await session.execute(statement)).scalar_one_or_none()
         if not db_task:
             return None
 
         db_task.is_completed = completed
-        db_task.updated_at = datetime.now(timezone.utc)
 
         session.add(db_task)
-        session.commit()
-        session.refresh(db_task)
+        await session.commit()
         return db_task
 
     @staticmethod
-    def delete_task(session: Session, task_id: uuid.UUID, user_id: uuid.UUID) -> bool:
-        statement = select(Task).where(Task.id == task_id, Task.user_id == user_id)
-        db_task = session.execute(statement).first()
-        if not db_task:
-            return False
-
-        session.delete(db_task)
-        session.commit()
-        return True
+    async def delete_task(session: AsyncSession, task_id: uuid.UUID, user_id: uuid.UUID) -> bool:
+        # Single DELETE instead of SELECT + DELETE
+        statement = delete(Task).where(Task.id == task_id, Task.user_id == user_id)
+        result = await session.execute(statement)
+        await session.commit()
+        return result.rowcount > 0
@@ -9,4 +9,4 @@ if [ -f .env ]; then
 fi
 
 # Run the application
-exec uvicorn app.main:app --host ${HOST:-0.0.0.0} --port ${PORT:-7860} --workers ${WORKERS:-1}
\ No newline at end of file
+exec uvicorn app.main:app --host ${HOST:-0.0.0.0} --port ${PORT:-7860} --workers ${WORKERS:-1} --loop uvloop --http httptools
\ No newline at end of file